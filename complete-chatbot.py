@@ -1,6 +1,9 @@
 import sys
 import os
-import uuid
+import re
+import html
+import shutil
+import subprocess
 import configparser
 import json
 from datetime import datetime
@@ -9,11 +12,68 @@ from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QTextEdit,
                             QLineEdit, QPushButton, QHBoxLayout, QLabel, 
                             QScrollArea, QSizePolicy, QMessageBox, QFileDialog,
                             QMenu, QDialog, QListWidget, QInputDialog)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QIcon, QFont, QAction
+from PyQt6.QtCore import (Qt, QObject, QTimer, QRunnable, QThreadPool,
+                          pyqtSignal)
+from PyQt6.QtGui import QIcon, QFont, QAction, QTextCursor
 from openai import OpenAI
 import requests
-from playsound import playsound
+from requests.adapters import HTTPAdapter
+
+# orjson serializes/parses conversation files several times faster than the
+# stdlib; fall back silently when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared session for ElevenLabs calls so repeated requests reuse the same
+# TCP/TLS connection instead of paying the handshake cost every utterance
+_TTS_SESSION = requests.Session()
+_TTS_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+# HTML templates for the two chat bubbles, built once at import instead of
+# re-assembling the inline CSS per message
+USER_BUBBLE = ('<div style="text-align: right;"><span style="background-color: #e9ecef; '
+               'padding: 5px 10px; border-radius: 10px; display: inline-block;">'
+               '<b>You:</b> {content}</span></div>')
+ASSISTANT_BUBBLE = ('<div style="text-align: left;"><span style="background-color: #d1ecf1; '
+                    'padding: 5px 10px; border-radius: 10px; display: inline-block;">'
+                    '<b>{assistant_name}:</b> {content}</span></div>')
+
+# Sentence boundary used to hand completed sentences to TTS mid-stream
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Cached system prompt from ai_guidance.txt, keyed on the file's mtime so the
+# file is only re-read when it actually changes
+_GUIDANCE_CACHE = {"mtime": None, "prompt": None}
+
+def load_guidance_prompt(guidance_file=Path('ai_guidance.txt')):
+    """Return the system prompt from ai_guidance.txt, re-reading only when the file changed"""
+    try:
+        mtime = guidance_file.stat().st_mtime
+    except OSError:
+        return None
+
+    if _GUIDANCE_CACHE["mtime"] != mtime:
+        try:
+            _GUIDANCE_CACHE["prompt"] = guidance_file.read_text(encoding='utf-8').strip() or None
+            _GUIDANCE_CACHE["mtime"] = mtime
+        except Exception as e:
+            print(f"Error reading ai_guidance.txt file: {e}")
+            return None
+
+    return _GUIDANCE_CACHE["prompt"]
+
+# Cached OpenAI client so requests reuse one HTTP connection pool instead of
+# rebuilding the client (and its TLS connections) on every message
+_OPENAI_CLIENT = {"api_key": None, "client": None}
+
+def get_openai_client(api_key):
+    """Return a shared OpenAI client, rebuilt only when the API key changes"""
+    if _OPENAI_CLIENT["api_key"] != api_key:
+        _OPENAI_CLIENT["client"] = OpenAI(api_key=api_key)
+        _OPENAI_CLIENT["api_key"] = api_key
+    return _OPENAI_CLIENT["client"]
 
 class Config:
     """Configuration handler for API keys and settings"""
@@ -29,22 +89,29 @@ class Config:
         self.model = "gpt-4"
         self.context_dir = Path('chat_contexts')
         self.assistant_name = "AI"
+        self.history_window = 20
         
-        # Set path for the ai_guidance.ini file
-        self.guidance_file = Path('ai_guidance.ini')
-        
-        # Create ai_guidance.ini file if it doesn't exist
+        # The system prompt lives in a plain text file; the old INI wrapper
+        # around a single key wasn't worth a ConfigParser parse per reader
+        self.guidance_file = Path('ai_guidance.txt')
+        legacy_guidance_file = Path('ai_guidance.ini')
+
+        # Create ai_guidance.txt if it doesn't exist, migrating the legacy INI once
         if not self.guidance_file.exists():
             try:
-                guidance_config = configparser.ConfigParser()
-                guidance_config['AI_GUIDANCE'] = {
-                    'system_prompt': "You are a helpful assistant. Please respond in a conversational tone, providing thoughtful and detailed answers. Feel free to ask clarifying questions when needed."
-                }
-                
-                with open(self.guidance_file, 'w', encoding='utf-8') as f:
-                    guidance_config.write(f)
+                prompt = None
+                if legacy_guidance_file.exists():
+                    guidance_config = configparser.ConfigParser()
+                    guidance_config.read(legacy_guidance_file)
+                    if 'AI_GUIDANCE' in guidance_config and 'system_prompt' in guidance_config['AI_GUIDANCE']:
+                        prompt = guidance_config['AI_GUIDANCE']['system_prompt']
+
+                if prompt is None:
+                    prompt = "You are a helpful assistant. Please respond in a conversational tone, providing thoughtful and detailed answers. Feel free to ask clarifying questions when needed."
+
+                self.guidance_file.write_text(prompt, encoding='utf-8')
             except Exception as e:
-                print(f"Error creating ai_guidance.ini file: {e}")
+                print(f"Error creating ai_guidance.txt file: {e}")
         
         # Create contexts directory if it doesn't exist
         self.context_dir.mkdir(exist_ok=True)
@@ -61,6 +128,9 @@ class Config:
             self.tts_enabled = self.config.getboolean('Settings', 'tts_enabled', fallback=True)
             self.model = self.config.get('API', 'model', fallback="gpt-4")
             self.assistant_name = self.config.get('Settings', 'assistant_name', fallback="AI")
+            # Clamp so a zero or negative value can't turn chat_history[-n:]
+            # into the whole transcript
+            self.history_window = max(1, self.config.getint('Settings', 'history_window', fallback=20))
         else:
             self.create_default_config()
     
@@ -74,7 +144,8 @@ class Config:
         }
         self.config['Settings'] = {
             'tts_enabled': 'true',
-            'assistant_name': 'AI'
+            'assistant_name': 'AI',
+            'history_window': '20'
         }
         
         # Create the directory if it doesn't exist
@@ -93,49 +164,79 @@ class Config:
         }
         self.config['Settings'] = {
             'tts_enabled': str(self.tts_enabled).lower(),
-            'assistant_name': self.assistant_name
+            'assistant_name': self.assistant_name,
+            'history_window': str(self.history_window)
         }
         
         with open(self.config_file, 'w') as f:
             self.config.write(f)
 
 
-# ================== WORKER THREAD FOR OPENAI REQUEST ===================
-class OpenAIWorker(QThread):
-    response_signal = pyqtSignal(str)  # Signal to send response back to GUI
-    error_signal = pyqtSignal(str)     # Signal to send errors back to GUI
+# ================== BACKGROUND FILE I/O ===================
+class IORunnable(QRunnable):
+    """Runs a blocking file I/O callable on the global thread pool"""
+
+    class Signals(QObject):
+        finished = pyqtSignal(object)
+        error = pyqtSignal(str)
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = IORunnable.Signals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+# ================== POOLED WORKER FOR OPENAI REQUEST ===================
+class OpenAIWorker(QRunnable):
 
-    def __init__(self, prompt, api_key, chat_history=None, system_prompt=None):
+    class Signals(QObject):
+        chunk_signal = pyqtSignal(str)     # Signal to stream partial response text to GUI
+        response_signal = pyqtSignal(str)  # Signal to send the complete response back to GUI
+        error_signal = pyqtSignal(str)     # Signal to send errors back to GUI
+
+    def __init__(self, prompt, api_key, chat_history=None, system_prompt=None, config=None):
         super().__init__()
         self.prompt = prompt
         self.api_key = api_key
         self.chat_history = chat_history or []
         self.system_prompt = system_prompt or "You are a helpful assistant."
-        self.model = "gpt-4"  # Default model
+        self.config = config
+        self.model = config.model if config else "gpt-4"
+        self._cancelled = False
+        self.signals = OpenAIWorker.Signals()
+
+    def cancel(self):
+        """Stop streaming and suppress any further signals from this worker"""
+        self._cancelled = True
 
     def run(self):
+        # The request may have been cancelled while queued in the pool
+        if self._cancelled:
+            return
         try:
             # Check if API key is set
             if not self.api_key:
-                self.error_signal.emit("Error: OpenAI API key is not set. Please set it in settings.")
+                self.signals.error_signal.emit("Error: OpenAI API key is not set. Please set it in settings.")
                 return
             
-            # Create OpenAI client with API key
-            client = OpenAI(api_key=self.api_key)
+            # Reuse the shared OpenAI client for this API key
+            client = get_openai_client(self.api_key)
             
-            # Get system prompt from ai_guidance.ini file in the current directory
+            # Use the system prompt snapshotted by the app. Re-reading the
+            # guidance file here could change the prompt mid-conversation,
+            # which would break OpenAI's server-side prompt caching: the
+            # cache only hits while the prefix stays byte-identical.
             system_content = self.system_prompt
-            system_prompt_file = Path('ai_guidance.ini')
-            
-            if system_prompt_file.exists():
-                try:
-                    guidance_config = configparser.ConfigParser()
-                    guidance_config.read(system_prompt_file)
-                    
-                    if 'AI_GUIDANCE' in guidance_config and 'system_prompt' in guidance_config['AI_GUIDANCE']:
-                        system_content = guidance_config['AI_GUIDANCE']['system_prompt']
-                except Exception as e:
-                    print(f"Error reading ai_guidance.ini file: {e}")
             
             # Prepare messages
             messages = [{"role": "system", "content": system_content}]
@@ -149,42 +250,58 @@ class OpenAIWorker(QThread):
             if not self.chat_history or self.chat_history[-1]["content"] != self.prompt:
                 messages.append({"role": "user", "content": self.prompt})
             
-            # Get model from config if available
-            if hasattr(self, 'config') and hasattr(self.config, 'model'):
-                self.model = self.config.model
-            
-            # Make API request with new client-based approach
+            # Make API request with streaming so the GUI can show text as it arrives
             response = client.chat.completions.create(
                 model=self.model,
-                messages=messages
+                messages=messages,
+                stream=True
             )
-            ai_text = response.choices[0].message.content
-            self.response_signal.emit(ai_text)
+
+            # Emit each delta as it arrives and accumulate the full reply
+            ai_text = ""
+            for chunk in response:
+                if self._cancelled:
+                    # Closing the stream drops the connection so the server
+                    # stops generating (and billing) the stale reply
+                    response.close()
+                    return
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    ai_text += delta
+                    self.signals.chunk_signal.emit(delta)
+            if not self._cancelled:
+                self.signals.response_signal.emit(ai_text)
         except Exception as e:
-            self.error_signal.emit(f"Error: {str(e)}")
+            if not self._cancelled:
+                self.signals.error_signal.emit(f"Error: {str(e)}")
 
 
-# ================== WORKER THREAD FOR ELEVENLABS TTS ===================
-class ElevenLabsWorker(QThread):
-    error_signal = pyqtSignal(str)  # Signal to send errors back to GUI
-    
+# ================== POOLED WORKER FOR ELEVENLABS TTS ===================
+class ElevenLabsWorker(QRunnable):
+
+    class Signals(QObject):
+        error_signal = pyqtSignal(str)     # Signal to send errors back to GUI
+        finished_signal = pyqtSignal()     # Emitted when playback ends, successful or not
+
     def __init__(self, text, api_key, voice_id):
         super().__init__()
         self.text = text
         self.api_key = api_key
         self.voice_id = voice_id
+        self.signals = ElevenLabsWorker.Signals()
 
     def run(self):
         try:
             # Check if API key and voice ID are set
             if not self.api_key or not self.voice_id:
-                self.error_signal.emit("Error: ElevenLabs API key or voice ID is not set. Text-to-speech is disabled.")
+                self.signals.error_signal.emit("Error: ElevenLabs API key or voice ID is not set. Text-to-speech is disabled.")
                 return
                 
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}"
+            url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
             headers = {
                 "xi-api-key": self.api_key,
-                "Content-Type": "application/json"
+                "Content-Type": "application/json",
+                "Connection": "keep-alive"
             }
             data = {
                 "text": self.text, 
@@ -194,18 +311,28 @@ class ElevenLabsWorker(QThread):
                 }
             }
 
-            response = requests.post(url, json=data, headers=headers)
-            
+            # Ask ElevenLabs to start returning audio as soon as possible
+            params = {"optimize_streaming_latency": 3}
+
+            response = _TTS_SESSION.post(url, json=data, headers=headers, params=params, stream=True)
+
             if response.status_code == 200:
-                # Create a temp directory if it doesn't exist
-                temp_dir = Path.home() / '.chatbot_temp'
-                temp_dir.mkdir(parents=True, exist_ok=True)
-                
-                audio_file = temp_dir / f"output_{uuid.uuid4()}.mp3"
-                with open(audio_file, "wb") as f:
-                    f.write(response.content)
-                playsound(str(audio_file))  # Play sound
-                os.remove(audio_file)  # Cleanup
+                player = shutil.which("ffplay")
+                if not player:
+                    self.signals.error_signal.emit("TTS Error: ffplay not found. Install ffmpeg to enable speech playback.")
+                    return
+
+                # Pipe MP3 chunks straight into the player so playback
+                # starts as soon as the first frames arrive
+                process = subprocess.Popen(
+                    [player, "-autoexit", "-nodisp", "-loglevel", "quiet", "-"],
+                    stdin=subprocess.PIPE
+                )
+                for chunk in response.iter_content(chunk_size=4096):
+                    if chunk:
+                        process.stdin.write(chunk)
+                process.stdin.close()
+                process.wait()
             else:
                 error_msg = f"TTS Error: {response.status_code}"
                 try:
@@ -213,9 +340,11 @@ class ElevenLabsWorker(QThread):
                     error_msg += f" - {error_data.get('detail', {}).get('message', '')}"
                 except:
                     pass
-                self.error_signal.emit(error_msg)
+                self.signals.error_signal.emit(error_msg)
         except Exception as e:
-            self.error_signal.emit(f"TTS Exception: {str(e)}")
+            self.signals.error_signal.emit(f"TTS Exception: {str(e)}")
+        finally:
+            self.signals.finished_signal.emit()
 
 
 # ================== LOAD CONVERSATION DIALOG ===================
@@ -260,23 +389,38 @@ class LoadConversationDialog(QDialog):
         """Refresh the list of conversations"""
         self.conversation_list.clear()
         
-        # Get all JSON files in the context directory
-        files = sorted(self.context_dir.glob('*.json'), key=os.path.getmtime, reverse=True)
-        
-        for file in files:
+        # Get all JSON files in the context directory, stat-ing each file
+        # exactly once instead of once for the sort and again for the label
+        entries = []
+        with os.scandir(self.context_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.json'):
+                    entries.append((Path(entry.path), entry.stat().st_mtime))
+        entries.sort(key=lambda item: item[1], reverse=True)
+
+        for file, mtime in entries:
             try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Display the title and date
-                    timestamp = datetime.fromtimestamp(os.path.getmtime(file))
-                    item_text = f"{file.stem} - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
-                    if 'title' in data and data['title']:
-                        item_text = f"{data['title']} - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
-                    self.conversation_list.addItem(item_text)
-                    # Store the filename as item data
-                    self.conversation_list.item(self.conversation_list.count()-1).setData(Qt.ItemDataRole.UserRole, str(file))
+                # Display the title and date
+                timestamp = datetime.fromtimestamp(mtime)
+                title = self.read_conversation_title(file) or file.stem
+                item_text = f"{title} - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
+                self.conversation_list.addItem(item_text)
+                # Store the filename as item data
+                self.conversation_list.item(self.conversation_list.count()-1).setData(Qt.ItemDataRole.UserRole, str(file))
             except Exception as e:
                 print(f"Error loading conversation file {file}: {e}")
+
+    def read_conversation_title(self, file):
+        """Read the conversation title from the head of the file without parsing the whole JSON"""
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                head = f.read(512)
+            match = re.search(r'"title"\s*:\s*"((?:[^"\\]|\\.)*)"', head)
+            if match:
+                return json.loads(f'"{match.group(1)}"')
+        except Exception as e:
+            print(f"Error reading title from {file}: {e}")
+        return None
     
     def get_selected_file(self):
         """Get the selected conversation file"""
@@ -369,16 +513,10 @@ class SettingsDialog(QWidget):
         layout.addWidget(QLabel("System Prompt (AI Personality & Instructions):"))
         self.system_prompt_edit = QTextEdit()
         try:
-            guidance_config = configparser.ConfigParser()
-            guidance_config.read(self.config.guidance_file)
-            
-            if 'AI_GUIDANCE' in guidance_config and 'system_prompt' in guidance_config['AI_GUIDANCE']:
-                self.system_prompt_edit.setText(guidance_config['AI_GUIDANCE']['system_prompt'])
-            else:
-                self.system_prompt_edit.setText("Default system prompt not found in ai_guidance.ini")
+            self.system_prompt_edit.setText(self.config.guidance_file.read_text(encoding='utf-8'))
         except Exception as e:
-            self.system_prompt_edit.setText("Error loading ai_guidance.ini file.")
-            print(f"Error loading ai_guidance.ini file: {e}")
+            self.system_prompt_edit.setText("Error loading ai_guidance.txt file.")
+            print(f"Error loading ai_guidance.txt file: {e}")
         
         self.system_prompt_edit.setMinimumHeight(150)
         layout.addWidget(self.system_prompt_edit)
@@ -398,26 +536,11 @@ class SettingsDialog(QWidget):
         self.config.model = self.model_input.text() or "gpt-4"
         self.config.assistant_name = self.assistant_name_input.text() or "AI"
         
-        # Save system prompt to ai_guidance.ini file
+        # Save system prompt to ai_guidance.txt file
         try:
-            guidance_config = configparser.ConfigParser()
-            
-            # Read existing file if it exists
-            if self.config.guidance_file.exists():
-                guidance_config.read(self.config.guidance_file)
-            
-            # Make sure the section exists
-            if 'AI_GUIDANCE' not in guidance_config:
-                guidance_config['AI_GUIDANCE'] = {}
-            
-            # Update the system prompt
-            guidance_config['AI_GUIDANCE']['system_prompt'] = self.system_prompt_edit.toPlainText()
-            
-            # Write to file
-            with open(self.config.guidance_file, 'w', encoding='utf-8') as f:
-                guidance_config.write(f)
+            self.config.guidance_file.write_text(self.system_prompt_edit.toPlainText(), encoding='utf-8')
         except Exception as e:
-            QMessageBox.warning(self, "Warning", f"Failed to save system prompt to ai_guidance.ini: {str(e)}")
+            QMessageBox.warning(self, "Warning", f"Failed to save system prompt to ai_guidance.txt: {str(e)}")
         
         self.config.save_config()
         self.settings_updated.emit()
@@ -427,12 +550,49 @@ class SettingsDialog(QWidget):
 
 # ================== PYQT6 CHATBOT UI ===================
 class ChatbotApp(QWidget):
+    # Older turns beyond the configured history window are folded into a
+    # background summary once this many have accumulated
+    SUMMARY_BATCH = 10
+
     def __init__(self):
         super().__init__()
         self.config = Config()
         self.chat_history = []
         self.system_prompt = ""
         self.current_conversation_file = None
+        self.ai_response_started = False
+        self.ai_worker = None
+
+        # Rolling summary of turns that have scrolled out of the history window
+        self._history_summary = ""
+        self._summary_cursor = 0
+        self._summary_inflight = False
+
+        # Sentence queue so TTS can start while the response is still streaming;
+        # one worker plays at a time to keep the audio in order
+        self._tts_queue = []
+        self._tts_busy = False
+        self._tts_buffer = ""
+
+        # Shared pool for chat, TTS and file I/O work; a small cap keeps
+        # bursts queued instead of spawning a thread per message
+        QThreadPool.globalInstance().setMaxThreadCount(4)
+
+        # Coalesce rapid successive messages into a single API request
+        self._pending_batch = []
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setSingleShot(True)
+        self._batch_timer.setInterval(250)
+        self._batch_timer.timeout.connect(self.dispatch_batch)
+
+        # Batch streamed tokens and flush to the display at ~30 Hz, so a fast
+        # stream costs one relayout per frame instead of one per token
+        self._token_buf = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(33)
+        self._flush_timer.timeout.connect(self.flush_token_buffer)
+
         self.initUI()
 
     def initUI(self):
@@ -529,12 +689,15 @@ class ChatbotApp(QWidget):
 
         main_layout.addLayout(input_layout)
 
-        # Status Bar
+        # Status Bar. The stylesheet is parsed once here; state changes only
+        # flip the "state" property instead of reassigning a stylesheet,
+        # which would re-resolve styles on every update
         self.status_bar = QLabel("Ready")
+        self.status_bar.setObjectName("statusBar")
+        self.status_bar.setProperty("state", "ok")
         self.status_bar.setStyleSheet("""
-            font-size: 12px;
-            color: #6c757d;
-            padding: 5px;
+            QLabel#statusBar { font-size: 12px; padding: 5px; color: #6c757d; }
+            QLabel#statusBar[state="warn"] { color: #dc3545; }
         """)
         main_layout.addWidget(self.status_bar)
 
@@ -547,22 +710,42 @@ class ChatbotApp(QWidget):
         self.check_api_keys()
 
     def load_system_prompt(self):
-        """Load system prompt from ai_guidance.ini"""
-        try:
-            guidance_config = configparser.ConfigParser()
-            guidance_config.read(self.config.guidance_file)
-            
-            if 'AI_GUIDANCE' in guidance_config and 'system_prompt' in guidance_config['AI_GUIDANCE']:
-                self.system_prompt = guidance_config['AI_GUIDANCE']['system_prompt']
-        except Exception as e:
-            print(f"Error loading system prompt: {e}")
-            self.system_prompt = "You are a helpful assistant."
+        """Load system prompt from ai_guidance.txt (mtime-cached)"""
+        # load_guidance_prompt only touches the disk when the file changed,
+        # so calling this on every settings save costs one stat syscall
+        self.system_prompt = load_guidance_prompt(self.config.guidance_file) \
+            or "You are a helpful assistant."
+
+    def append_bubble(self, fragment):
+        """Insert a chat bubble at the end of the display.
+
+        QTextEdit.append re-parses and relayouts proportionally to the whole
+        document; inserting through a cursor at End only lays out the new block.
+        """
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertBlock()
+        cursor.insertHtml(fragment)
+        self.chat_display.setTextCursor(cursor)
+        self.chat_display.ensureCursorVisible()
+
+    def set_status_state(self, state):
+        """Switch the status bar colour ("ok"/"warn") without a stylesheet reparse"""
+        if self.status_bar.property("state") != state:
+            self.status_bar.setProperty("state", state)
+            self.status_bar.style().unpolish(self.status_bar)
+            self.status_bar.style().polish(self.status_bar)
+
+    def set_status(self, text, state="ok"):
+        """Update status text and colour, skipping work when nothing changed"""
+        if self.status_bar.text() != text:
+            self.status_bar.setText(text)
+        self.set_status_state(state)
 
     def check_api_keys(self):
         """Check if API keys are set and show warning if not"""
         if not self.config.openai_api_key:
-            self.status_bar.setText("Warning: OpenAI API key not set. Please go to Settings.")
-            self.status_bar.setStyleSheet("font-size: 12px; color: #dc3545; padding: 5px;")
+            self.set_status("Warning: OpenAI API key not set. Please go to Settings.", "warn")
 
     def open_settings(self):
         """Open the settings dialog"""
@@ -575,8 +758,7 @@ class ChatbotApp(QWidget):
         self.load_system_prompt()
         self.check_api_keys()
         if self.config.openai_api_key:
-            self.status_bar.setText("Ready")
-            self.status_bar.setStyleSheet("font-size: 12px; color: #6c757d; padding: 5px;")
+            self.set_status("Ready")
 
     def new_conversation(self):
         """Start a new conversation"""
@@ -596,12 +778,25 @@ class ChatbotApp(QWidget):
                 if not self.save_conversation():
                     return  # User canceled the save dialog
         
+        # A reply still streaming belongs to the conversation being left;
+        # kill it before the transcript is replaced so no more chunks land
+        self.cancel_inflight_reply()
+        self.ai_response_started = False
+        self._token_buf.clear()
+
+        # Drop any messages still waiting in the send debounce window;
+        # they belong to the conversation being left
+        self._batch_timer.stop()
+        self._pending_batch.clear()
+
         # Clear the chat history and display
         self.chat_history = []
         self.chat_display.clear()
+        self._history_summary = ""
+        self._summary_cursor = 0
         self.current_conversation_file = None
         self.conversation_label.setText("New Conversation")
-        self.status_bar.setText("New conversation started")
+        self.set_status("New conversation started")
     
     def save_conversation(self):
         """Save the current conversation"""
@@ -661,16 +856,34 @@ class ChatbotApp(QWidget):
                 "title": title or Path(file_path).stem,
                 "date": datetime.now().isoformat(),
                 "system_prompt": self.system_prompt,
-                "messages": self.chat_history
+                # Snapshot the history: the pool thread serializes this
+                # while the UI thread keeps appending new turns to the live
+                # list, which could tear the saved file
+                "messages": list(self.chat_history)
             }
             
-            # Save to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(conversation_data, f, indent=2, ensure_ascii=False)
-            
+            # Write on the thread pool so a large transcript doesn't freeze the UI
+            # Compact output: the file is only ever read back by this app,
+            # so pretty-printing just costs formatting time and bytes
+            def write_file():
+                if orjson is not None:
+                    with open(file_path, 'wb') as f:
+                        f.write(orjson.dumps(conversation_data))
+                else:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(conversation_data, f, separators=(',', ':'), ensure_ascii=False)
+
+            task = IORunnable(write_file)
+            task.signals.finished.connect(
+                lambda _: self.set_status(f"Conversation saved to {file_path}"))
+            task.signals.error.connect(
+                lambda msg: QMessageBox.warning(self, "Error", f"Failed to save conversation: {msg}"))
+            self._io_task = task
+            QThreadPool.globalInstance().start(task)
+
             self.current_conversation_file = file_path
             self.conversation_label.setText(conversation_data["title"])
-            self.status_bar.setText(f"Conversation saved to {file_path}")
+            self.set_status(f"Saving conversation to {file_path}...")
             return True
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to save conversation: {str(e)}")
@@ -682,86 +895,323 @@ class ChatbotApp(QWidget):
         if dialog.exec():
             file_path = dialog.get_selected_file()
             if file_path and os.path.exists(file_path):
-                try:
+                # Read and parse on the thread pool, then apply on the UI thread
+                def read_file():
+                    if orjson is not None:
+                        with open(file_path, 'rb') as f:
+                            return orjson.loads(f.read())
                     with open(file_path, 'r', encoding='utf-8') as f:
-                        conversation_data = json.load(f)
-                    
-                    # Check if the data has the expected structure
-                    if "messages" not in conversation_data:
-                        raise ValueError("Invalid conversation file format")
-                    
-                    # Clear current conversation
-                    self.chat_history = []
-                    self.chat_display.clear()
-                    
-                    # Load system prompt if available
-                    if "system_prompt" in conversation_data:
-                        self.system_prompt = conversation_data["system_prompt"]
-                    
-                    # Load messages
-                    self.chat_history = conversation_data["messages"]
-                    
-                    # Update the display
-                    for message in self.chat_history:
-                        if message["role"] == "user":
-                            self.chat_display.append(f'<div style="text-align: right;"><span style="background-color: #e9ecef; padding: 5px 10px; border-radius: 10px; display: inline-block;"><b>You:</b> {message["content"]}</span></div>')
-                        elif message["role"] == "assistant":
-                            self.chat_display.append(f'<div style="text-align: left;"><span style="background-color: #d1ecf1; padding: 5px 10px; border-radius: 10px; display: inline-block;"><b>{self.config.assistant_name}:</b> {message["content"]}</span></div>')
-                    
-                    # Update current file and label
-                    self.current_conversation_file = file_path
-                    self.conversation_label.setText(conversation_data.get("title", Path(file_path).stem))
-                    self.status_bar.setText(f"Conversation loaded from {file_path}")
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", f"Failed to load conversation: {str(e)}")
+                        return json.load(f)
+
+                task = IORunnable(read_file)
+                task.signals.finished.connect(
+                    lambda data: self.apply_loaded_conversation(data, file_path))
+                task.signals.error.connect(
+                    lambda msg: QMessageBox.warning(self, "Error", f"Failed to load conversation: {msg}"))
+                self._io_task = task
+                QThreadPool.globalInstance().start(task)
+
+    def apply_loaded_conversation(self, conversation_data, file_path):
+        """Populate the UI from parsed conversation data"""
+        try:
+            # Check if the data has the expected structure
+            if "messages" not in conversation_data:
+                raise ValueError("Invalid conversation file format")
+
+            # A reply still streaming belongs to the conversation being
+            # replaced; kill it before the transcript changes underneath it
+            self.cancel_inflight_reply()
+            self.ai_response_started = False
+            self._token_buf.clear()
+
+            # Drop any messages still waiting in the send debounce window;
+            # they belong to the conversation being replaced
+            self._batch_timer.stop()
+            self._pending_batch.clear()
+
+            # Clear current conversation
+            self.chat_history = []
+            self.chat_display.clear()
+            self._history_summary = ""
+            self._summary_cursor = 0
+
+            # Load system prompt if available
+            if "system_prompt" in conversation_data:
+                self.system_prompt = conversation_data["system_prompt"]
+
+            # Load messages
+            self.chat_history = conversation_data["messages"]
+
+            # Build the whole transcript as one HTML string and hand it to Qt
+            # in a single parse/layout pass instead of one per message.
+            # Escaping the content also stops Qt from interpreting any markup
+            # that happens to appear in a saved message.
+            parts = []
+            for message in self.chat_history:
+                content = html.escape(message["content"])
+                if message["role"] == "user":
+                    parts.append(USER_BUBBLE.format(content=content))
+                elif message["role"] == "assistant":
+                    parts.append(ASSISTANT_BUBBLE.format(assistant_name=self.config.assistant_name, content=content))
+            self.chat_display.setHtml("".join(parts))
+            self.chat_display.moveCursor(QTextCursor.MoveOperation.End)
+
+            # Update current file and label
+            self.current_conversation_file = file_path
+            self.conversation_label.setText(conversation_data.get("title", Path(file_path).stem))
+            self.set_status(f"Conversation loaded from {file_path}")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load conversation: {str(e)}")
+
+    def cancel_inflight_reply(self):
+        """Cancel a stale streaming reply and drain its buffered output"""
+        if self.ai_worker is None:
+            return
+        self.ai_worker.cancel()
+        # Dropping the reference makes the sender checks in the display
+        # slots reject any of its signals still queued in the event loop
+        self.ai_worker = None
+        # Flush buffered chunks now, while document End still points into
+        # the stale reply's bubble
+        self._flush_timer.stop()
+        self.flush_token_buffer()
+        # Drop the dead reply's speech: the partial sentence must not be
+        # glued onto the new reply's first one, and unplayed queued
+        # sentences shouldn't speak ahead of the new answer. The utterance
+        # already playing runs out on its own
+        self._tts_buffer = ""
+        self._tts_queue.clear()
 
     def send_message(self):
         user_text = self.user_input.text().strip()
         if user_text:
+            # A reply still streaming for an earlier message is stale once
+            # the user has moved on. Cancel it before the new user bubble
+            # goes in: token flushes insert at document End, which must not
+            # yet be past the stale reply's bubble
+            self.cancel_inflight_reply()
+
             # Update UI
-            self.chat_display.append(f'<div style="text-align: right;"><span style="background-color: #e9ecef; padding: 5px 10px; border-radius: 10px; display: inline-block;"><b>You:</b> {user_text}</span></div>')
+            self.append_bubble(USER_BUBBLE.format(content=html.escape(user_text)))
             self.user_input.clear()
-            self.status_bar.setText("AI is thinking...")
 
-            # Add to chat history
-            self.chat_history.append({"role": "user", "content": user_text})
+            # Buffer the message briefly so rapid successive turns can be
+            # batched into one API request instead of paying a round trip each
+            self._pending_batch.append(user_text)
+            if len(self._pending_batch) >= 8:
+                self._batch_timer.stop()
+                self.dispatch_batch()
+            else:
+                self._batch_timer.start()
 
-            # Run OpenAI in a background thread
-            self.ai_worker = OpenAIWorker(
-                user_text, 
-                self.config.openai_api_key,
-                chat_history=self.chat_history,
-                system_prompt=self.system_prompt
-            )
-            # Pass the config to the worker
-            self.ai_worker.config = self.config
-            self.ai_worker.response_signal.connect(self.display_ai_response)
-            self.ai_worker.error_signal.connect(self.display_error)
-            self.ai_worker.start()
+    def dispatch_batch(self):
+        """Send the buffered user message(s) as a single chat turn."""
+        batch = self._pending_batch
+        self._pending_batch = []
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            user_text = batch[0]
+        else:
+            # Combine the buffered messages into one numbered prompt
+            numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(batch, 1))
+            user_text = ("Please answer each of the following messages separately:\n"
+                         f"{numbered}")
+
+        self.set_status("AI is thinking...")
+
+        # Add to chat history
+        self.chat_history.append({"role": "user", "content": user_text})
+
+        # Send only the recent window; anything older is represented by the
+        # rolling summary so per-turn upload and prefill cost stay bounded
+        recent_history = self.chat_history[-self.config.history_window:]
+        system_prompt = self.system_prompt
+        if self._history_summary:
+            system_prompt = (f"{self.system_prompt}\n\n"
+                             f"Summary of the earlier conversation:\n{self._history_summary}")
+
+        # Run OpenAI in a background thread
+        self.ai_worker = OpenAIWorker(
+            user_text,
+            self.config.openai_api_key,
+            chat_history=recent_history,
+            system_prompt=system_prompt,
+            config=self.config
+        )
+        self.ai_response_started = False
+        self.ai_worker.signals.chunk_signal.connect(self.display_ai_chunk)
+        self.ai_worker.signals.response_signal.connect(self.display_ai_response)
+        self.ai_worker.signals.error_signal.connect(self.display_error)
+        QThreadPool.globalInstance().start(self.ai_worker)
+
+    def display_ai_chunk(self, chunk_text):
+        """Buffer a streamed response chunk; the flush timer batches display updates."""
+        # Drop chunks a cancelled worker emitted before it saw the flag
+        if self.ai_worker is None or self.sender() is not self.ai_worker.signals:
+            return
+
+        if not self.ai_response_started:
+            # Start a new message bubble for this response
+            self.append_bubble(ASSISTANT_BUBBLE.format(assistant_name=self.config.assistant_name, content=""))
+            self.ai_response_started = True
+
+        self._token_buf.append(chunk_text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+        # Hand completed sentences to TTS while the stream is still running,
+        # so audio starts after the first sentence instead of the last token
+        if self.tts_configured():
+            self._tts_buffer += chunk_text
+            parts = SENTENCE_RE.split(self._tts_buffer)
+            if len(parts) > 1:
+                for sentence in parts[:-1]:
+                    self.queue_tts(sentence)
+                self._tts_buffer = parts[-1]
+
+    def flush_token_buffer(self):
+        """Insert buffered stream chunks into the current bubble in one pass"""
+        if not self._token_buf:
+            return
+        text = "".join(self._token_buf)
+        self._token_buf.clear()
+
+        # Insert at the end of the current bubble rather than appending a
+        # new block for every flush
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        self.chat_display.setTextCursor(cursor)
+        self.chat_display.ensureCursorVisible()
 
     def display_ai_response(self, ai_text):
-        """Handles AI response and triggers TTS."""
-        # Update UI with custom assistant name
-        self.chat_display.append(f'<div style="text-align: left;"><span style="background-color: #d1ecf1; padding: 5px 10px; border-radius: 10px; display: inline-block;"><b>{self.config.assistant_name}:</b> {ai_text}</span></div>')
-        self.status_bar.setText("Ready")
-        
+        """Handles the completed AI response and queues any remaining TTS."""
+        # Ignore a completion from a worker that has since been cancelled
+        if self.ai_worker is None or self.sender() is not self.ai_worker.signals:
+            return
+
+        streamed = self.ai_response_started
+        # Drain whatever the flush timer hasn't shown yet
+        self._flush_timer.stop()
+        self.flush_token_buffer()
+        # If streaming didn't produce any chunks, render the whole reply at once
+        if not streamed:
+            self.append_bubble(ASSISTANT_BUBBLE.format(assistant_name=self.config.assistant_name, content=html.escape(ai_text)))
+        self.ai_response_started = False
+        self.set_status("Ready")
+
         # Add to chat history
         self.chat_history.append({"role": "assistant", "content": ai_text})
 
-        # Run ElevenLabs TTS in a background thread if enabled
-        if self.config.tts_enabled:
-            self.tts_worker = ElevenLabsWorker(
-                ai_text, 
-                self.config.elevenlabs_api_key,
-                self.config.elevenlabs_voice_id
-            )
-            self.tts_worker.error_signal.connect(self.display_error)
-            self.tts_worker.start()
-    
+        # Fold older turns into the rolling summary once enough have
+        # accumulated beyond the history window
+        self.maybe_summarize_history()
+
+        # Queue whatever speech is still outstanding: the trailing partial
+        # sentence for a streamed reply, or the whole text otherwise
+        if self.tts_configured():
+            leftover = self._tts_buffer if streamed else ai_text
+            self._tts_buffer = ""
+            self.queue_tts(leftover)
+
+    def tts_configured(self):
+        """Return True when TTS is enabled and the ElevenLabs credentials are set"""
+        return bool(self.config.tts_enabled
+                    and self.config.elevenlabs_api_key
+                    and self.config.elevenlabs_voice_id)
+
+    def queue_tts(self, text):
+        """Queue a piece of text for speech, preserving playback order"""
+        text = text.strip()
+        if not text:
+            return
+        self._tts_queue.append(text)
+        self.start_next_tts()
+
+    def start_next_tts(self):
+        """Start the next queued TTS worker if none is playing"""
+        if self._tts_busy or not self._tts_queue:
+            return
+        self._tts_busy = True
+        self.tts_worker = ElevenLabsWorker(
+            self._tts_queue.pop(0),
+            self.config.elevenlabs_api_key,
+            self.config.elevenlabs_voice_id
+        )
+        self.tts_worker.signals.error_signal.connect(self.display_error)
+        self.tts_worker.signals.finished_signal.connect(self.on_tts_finished)
+        QThreadPool.globalInstance().start(self.tts_worker)
+
+    def on_tts_finished(self):
+        """Advance the TTS queue when the current utterance ends"""
+        self._tts_busy = False
+        self.start_next_tts()
+
+
+    def maybe_summarize_history(self):
+        """Summarize turns that fell out of the history window, in the background"""
+        # One summarizer at a time; without this, every reply between the
+        # trigger and the completion would spawn another paid API call
+        # over mostly the same excerpt
+        if self._summary_inflight:
+            return
+        cutoff = len(self.chat_history) - self.config.history_window
+        if cutoff - self._summary_cursor < self.SUMMARY_BATCH:
+            return
+
+        older = self.chat_history[self._summary_cursor:cutoff]
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in older)
+        prompt = ("Summarize the conversation excerpt below in one short paragraph, "
+                  "keeping any facts, names, and decisions needed to continue the conversation.")
+        if self._history_summary:
+            prompt += f"\n\nSummary so far:\n{self._history_summary}"
+        prompt += f"\n\nExcerpt:\n{transcript}"
+
+        worker = OpenAIWorker(prompt, self.config.openai_api_key,
+                              system_prompt="You summarize conversations.",
+                              config=self.config)
+        worker.signals.response_signal.connect(
+            lambda summary: self.apply_history_summary(summary, cutoff))
+        worker.signals.error_signal.connect(self.on_summary_error)
+        self._summary_inflight = True
+        self._summary_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def apply_history_summary(self, summary, cutoff):
+        """Record a finished background summary of older turns"""
+        self._summary_inflight = False
+        # A late result computed against an older cutoff must not overwrite
+        # a newer summary or move the cursor backwards
+        if cutoff <= self._summary_cursor:
+            return
+        if summary:
+            self._history_summary = summary
+            self._summary_cursor = cutoff
+
+    def on_summary_error(self, _error_msg):
+        """Allow another summarization attempt after a failed one"""
+        self._summary_inflight = False
+
+    def closeEvent(self, event):
+        """Give in-flight pool work (API calls, file writes) a chance to finish"""
+        # Stop the streaming reply first so its worker can exit inside the
+        # drain window instead of running the stream to completion
+        if self.ai_worker is not None:
+            self.ai_worker.cancel()
+        # Only release the shared HTTP pools once the pool has actually
+        # drained; closing them under a still-running worker (e.g. a TTS
+        # worker blocked on playback) would make it raise during shutdown
+        if QThreadPool.globalInstance().waitForDone(3000):
+            _TTS_SESSION.close()
+            if _OPENAI_CLIENT["client"] is not None:
+                _OPENAI_CLIENT["client"].close()
+        super().closeEvent(event)
+
     def display_error(self, error_msg):
         """Display errors in the status bar"""
-        self.status_bar.setText(error_msg)
-        self.status_bar.setStyleSheet("font-size: 12px; color: #dc3545; padding: 5px;")
+        self.set_status(error_msg, "warn")
 
 
 # ================== RUN PYQT APPLICATION ===================